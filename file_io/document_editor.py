@@ -1,18 +1,154 @@
+import os
 import re
 import shutil
+from bisect import bisect_right
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List
 
+try:
+    import ahocorasick
+except ImportError:  # Optional; the regex fallback covers the same cases.
+    ahocorasick = None
 
+_INVALID_FILENAME_CHARS = re.compile(r'[<>:"/\\|?*]')
+_MULTIPLE_UNDERSCORES = re.compile(r'_+')
+
+
+class _ReplacementMatcher:
+    """Single-scan multi-pattern matcher over a from->to mapping.
+
+    Backed by a pyahocorasick automaton when the package is installed and by
+    a compiled regex alternation otherwise. Either way each text is scanned
+    once, no matter how many keys the mapping holds, and matches are
+    leftmost-longest and non-overlapping.
+    """
+
+    def __init__(self, mapping: Dict[str, str]):
+        self.mapping = mapping
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for key, value in mapping.items():
+                automaton.add_word(key, (len(key), value))
+            automaton.make_automaton()
+            self._automaton = automaton
+            self._pattern = None
+        else:
+            self._automaton = None
+            self._pattern = _compile_pattern(mapping)
+
+    def finditer(self, text: str):
+        """Yield (start, end, replacement) for each match in `text`."""
+        if self._pattern is not None:
+            for match in self._pattern.finditer(text):
+                yield match.start(), match.end(), self.mapping[match.group(0)]
+        else:
+            for end_index, (length, replacement) in self._automaton.iter_long(text):
+                yield end_index - length + 1, end_index + 1, replacement
+
+    def sub(self, text: str) -> str:
+        """Return `text` with all matches replaced (unchanged if none)."""
+        pieces = []
+        last_end = 0
+        for start, end, replacement in self.finditer(text):
+            pieces.append(text[last_end:start])
+            pieces.append(replacement)
+            last_end = end
+        if not pieces:
+            return text
+        pieces.append(text[last_end:])
+        return "".join(pieces)
+
+
+def _rewrite_text_elements(t_elems, matcher) -> bool:
+    """Apply `matcher` substitutions across a list of w:t elements.
+
+    The replacement text is written into the existing elements, so runs that
+    the match does not touch keep their formatting. Matches spanning several
+    elements shrink the first, blank the middle ones, and trim the last.
+    """
+    from docx.oxml.ns import qn
+
+    texts = [t.text or "" for t in t_elems]
+    joined = "".join(texts)
+
+    matches = list(matcher.finditer(joined))
+    if not matches:
+        return False
+
+    bounds = []
+    offset = 0
+    for text in texts:
+        bounds.append(offset)
+        offset += len(text)
+
+    def locate(pos: int):
+        idx = bisect_right(bounds, pos) - 1
+        return idx, pos - bounds[idx]
+
+    # Walk matches right to left so original offsets stay valid while editing.
+    for start, end, new_text in reversed(matches):
+        idx_start, off_start = locate(start)
+        idx_end, off_end = locate(end - 1)
+        off_end += 1
+
+        if idx_start == idx_end:
+            texts[idx_start] = (
+                texts[idx_start][:off_start] + new_text + texts[idx_start][off_end:]
+            )
+        else:
+            texts[idx_start] = texts[idx_start][:off_start] + new_text
+            for i in range(idx_start + 1, idx_end):
+                texts[i] = ""
+            texts[idx_end] = texts[idx_end][off_end:]
+
+    for t_elem, text in zip(t_elems, texts):
+        if (t_elem.text or "") != text:
+            t_elem.text = text
+            if text != text.strip():
+                t_elem.set(qn("xml:space"), "preserve")
+
+    return True
+
+
+@lru_cache(maxsize=1024)
 def sanitize_filename(name: str) -> str:
-    sanitized = re.sub(r'[<>:"/\\|?*]', '_', name)
+    sanitized = _INVALID_FILENAME_CHARS.sub('_', name)
     sanitized = sanitized.strip(' .')
-    sanitized = re.sub(r'_+', '_', sanitized)
+    sanitized = _MULTIPLE_UNDERSCORES.sub('_', sanitized)
     return sanitized
 
 
+def fast_copy(source_path: Path, dest_path: Path) -> None:
+    """Copy a file, preferring the kernel-side os.copy_file_range path.
+
+    copy_file_range moves bytes without a userspace bounce buffer and can
+    use reflinks or server-side copy on capable filesystems. Falls back to
+    shutil.copyfile where the syscall is missing or refuses (e.g. across
+    devices). Metadata is preserved either way, matching shutil.copy2.
+    """
+    copied_in_kernel = False
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(source_path, "rb") as src, open(dest_path, "wb") as dst:
+                remaining = os.fstat(src.fileno()).st_size
+                while remaining > 0:
+                    moved = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                    if moved == 0:
+                        break
+                    remaining -= moved
+            copied_in_kernel = remaining == 0
+        except OSError:
+            copied_in_kernel = False
+
+    if not copied_in_kernel:
+        shutil.copyfile(source_path, dest_path)
+
+    shutil.copystat(source_path, dest_path)
+
+
 def duplicate_document(source_path: Path, company_name: str) -> Path:
-    if not source_path.exists():
+    if not os.path.exists(source_path):
         raise FileNotFoundError(f"Source file not found: {source_path}")
     
     sanitized_company = sanitize_filename(company_name)
@@ -22,156 +158,270 @@ def duplicate_document(source_path: Path, company_name: str) -> Path:
     stem = source_path.stem
     suffix = source_path.suffix
     new_name = f"{stem}_{sanitized_company}{suffix}"
-    new_path = source_path.parent / new_name
-    
+
+    # One directory listing instead of a stat() per candidate name.
+    with os.scandir(source_path.parent) as entries:
+        existing_names = {entry.name for entry in entries}
+
     counter = 1
-    original_new_path = new_path
-    while new_path.exists():
+    while new_name in existing_names:
         new_name = f"{stem}_{sanitized_company}_{counter}{suffix}"
-        new_path = source_path.parent / new_name
         counter += 1
         if counter > 1000:  # Safety limit
-            raise RuntimeError(f"Could not generate unique filename for {original_new_path}")
-    
-    shutil.copy2(source_path, new_path)
+            raise RuntimeError(
+                f"Could not generate unique filename for "
+                f"{source_path.parent / f'{stem}_{sanitized_company}{suffix}'}"
+            )
+
+    new_path = source_path.parent / new_name
+    fast_copy(source_path, new_path)
     return new_path
 
 
+def _build_mapping(replacements: Dict[str, List[Dict[str, str]]]) -> Dict[str, str]:
+    all_replacements = []
+    all_replacements.extend(replacements.get("role_replacements", []))
+    all_replacements.extend(replacements.get("skill_replacements", []))
+
+    return {
+        r.get("from", ""): r.get("to", "")
+        for r in all_replacements
+        if r.get("from", "") and r.get("from", "") != r.get("to", "")
+    }
+
+
+def _compile_pattern(mapping: Dict[str, str]):
+    # Longest keys first so overlapping patterns prefer the longer match.
+    return re.compile(
+        "|".join(re.escape(key) for key in sorted(mapping, key=len, reverse=True))
+    )
+
+
+def _scan_docx_for_keys(file_path: Path, keys) -> set:
+    """Return the subset of `keys` that occur in the raw XML text of a DOCX.
+
+    Reads the archive's XML parts as bytes, strips the markup (so text split
+    across runs coalesces) and undoes XML escaping, then tests each key —
+    all without building a python-docx Document.
+    """
+    import zipfile
+    from xml.sax.saxutils import unescape
+
+    with zipfile.ZipFile(file_path) as archive:
+        blobs = b"\n".join(
+            archive.read(name)
+            for name in archive.namelist()
+            if name.endswith(".xml")
+        )
+
+    text = unescape(re.sub(rb"<[^>]*>", b"", blobs).decode("utf-8", errors="ignore"))
+    return {key for key in keys if key in text}
+
+
+def iter_all_paragraphs(doc):
+    """Yield every paragraph in the document exactly once.
+
+    Covers the body, tables (including tables nested inside cells), and each
+    section's header and footer.
+    """
+    def from_tables(tables):
+        stack = list(tables)
+        while stack:
+            table = stack.pop()
+            for row in table.rows:
+                for cell in row.cells:
+                    yield from cell.paragraphs
+                    stack.extend(cell.tables)
+
+    yield from doc.paragraphs
+    yield from from_tables(doc.tables)
+
+    for section in doc.sections:
+        for part in (section.header, section.footer):
+            if part:
+                yield from part.paragraphs
+                yield from from_tables(part.tables)
+
+
+def _apply_mapping_to_doc(doc, mapping: Dict[str, str]) -> bool:
+    from docx.oxml.ns import qn
+
+    matcher = _ReplacementMatcher(mapping)
+    changed = False
+
+    for paragraph in iter_all_paragraphs(doc):
+        # _rewrite_text_elements joins the w:t text once and bails out on no
+        # match, so the paragraph.text property (a second full run walk) is
+        # not needed as a prefilter.
+        t_elems = paragraph._p.findall(".//" + qn("w:t"))
+        if _rewrite_text_elements(t_elems, matcher):
+            changed = True
+
+    return changed
+
+
+def apply_replacements_with_doc(doc, replacements: Dict[str, List[Dict[str, str]]]) -> bool:
+    """Apply replacements to an already-loaded python-docx Document.
+
+    Returns True if anything changed; the caller is responsible for saving.
+    """
+    mapping = _build_mapping(replacements)
+    if not mapping:
+        return False
+    return _apply_mapping_to_doc(doc, mapping)
+
+
 def apply_replacements_to_docx(file_path: Path, replacements: Dict[str, List[Dict[str, str]]]) -> None:
-    from docx import Document
-    
-    if not file_path.exists():
+    if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
-    
+
     try:
-        doc = Document(str(file_path))
-        
-        all_replacements = []
-        all_replacements.extend(replacements.get("role_replacements", []))
-        all_replacements.extend(replacements.get("skill_replacements", []))
-        
-        if not all_replacements:
+        mapping = _build_mapping(replacements)
+        if not mapping:
             return
-        
-        def replace_in_paragraph(paragraph, old_text: str, new_text: str) -> bool:
-            if old_text not in paragraph.text:
-                return False
-            
-            full_text = paragraph.text
-            if old_text in full_text:
-                paragraph.clear()
-                parts = full_text.split(old_text, 1)
-                if len(parts) == 2:
-                    if parts[0]:
-                        paragraph.add_run(parts[0])
-                    paragraph.add_run(new_text)
-                    if parts[1]:
-                        paragraph.add_run(parts[1])
-                    return True
-            return False
-        
-        for replacement in all_replacements:
-            old_text = replacement.get("from", "")
-            new_text = replacement.get("to", "")
-            
-            if not old_text or old_text == new_text:
-                continue
-            
-            for paragraph in doc.paragraphs:
-                replace_in_paragraph(paragraph, old_text, new_text)
-            
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        for paragraph in cell.paragraphs:
-                            replace_in_paragraph(paragraph, old_text, new_text)
-            
-            for section in doc.sections:
-                if section.header:
-                    for paragraph in section.header.paragraphs:
-                        replace_in_paragraph(paragraph, old_text, new_text)
-                    for table in section.header.tables:
-                        for row in table.rows:
-                            for cell in row.cells:
-                                for paragraph in cell.paragraphs:
-                                    replace_in_paragraph(paragraph, old_text, new_text)
-                
-                if section.footer:
-                    for paragraph in section.footer.paragraphs:
-                        replace_in_paragraph(paragraph, old_text, new_text)
-                    for table in section.footer.tables:
-                        for row in table.rows:
-                            for cell in row.cells:
-                                for paragraph in cell.paragraphs:
-                                    replace_in_paragraph(paragraph, old_text, new_text)
-        
-        doc.save(str(file_path))
-        
+
+        # Cheap raw-bytes membership test before paying for the XML parse.
+        present_keys = _scan_docx_for_keys(file_path, mapping)
+        if not present_keys:
+            return
+        mapping = {key: mapping[key] for key in present_keys}
+
+        from docx import Document
+
+        doc = Document(str(file_path))
+        if _apply_mapping_to_doc(doc, mapping):
+            doc.save(str(file_path))
+
     except Exception as e:
         raise RuntimeError(f"Failed to edit DOCX file {file_path}: {e}") from e
 
 
+def duplicate_and_edit(source_path: Path, company_name: str, replacements: Dict[str, List[Dict[str, str]]]) -> Path:
+    """Duplicate a document and apply replacements with one load/save of the copy.
+
+    For DOCX the fresh copy is parsed and written exactly once, skipping the
+    raw-bytes prescan that apply_replacements_to_docx would repeat on a file
+    we are about to parse anyway.
+    """
+    new_path = duplicate_document(source_path, company_name)
+
+    mapping = _build_mapping(replacements)
+    if not mapping:
+        return new_path
+
+    if new_path.suffix.lower() == ".docx":
+        from docx import Document
+
+        doc = Document(str(new_path))
+        try:
+            if _apply_mapping_to_doc(doc, mapping):
+                doc.save(str(new_path))
+        except Exception as e:
+            raise RuntimeError(f"Failed to edit DOCX file {new_path}: {e}") from e
+    else:
+        apply_replacements(new_path, replacements)
+
+    return new_path
+
+
+def _apply_mapping_to_odf_doc(doc, mapping: Dict[str, str]) -> bool:
+    from odf.text import P
+
+    matcher = _ReplacementMatcher(mapping)
+    changed = False
+
+    # One tree walk and one matcher scan per paragraph, instead of one walk
+    # and one substring scan per (paragraph, replacement) pair.
+    for paragraph in doc.getElementsByType(P):
+        text_nodes = []
+        parts = []
+        for node in paragraph.childNodes:
+            if node.nodeType == node.TEXT_NODE:
+                text_nodes.append(node)
+                parts.append(node.data)
+
+        joined = "".join(parts)
+        new_text = matcher.sub(joined)
+        if new_text == joined:
+            continue
+
+        # Rewrite node data in place; no removeChild/appendChild churn.
+        text_nodes[0].data = new_text
+        for node in text_nodes[1:]:
+            node.data = ""
+        changed = True
+
+    return changed
+
+
 def apply_replacements_to_odt(file_path: Path, replacements: Dict[str, List[Dict[str, str]]]) -> None:
-    from odf.opendocument import load
-    from odf.text import P, Span
-    
-    if not file_path.exists():
+    if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
-    
+
     try:
-        doc = load(str(file_path))
-        
-        all_replacements = []
-        all_replacements.extend(replacements.get("role_replacements", []))
-        all_replacements.extend(replacements.get("skill_replacements", []))
-        
-        if not all_replacements:
+        mapping = _build_mapping(replacements)
+        if not mapping:
             return
-        
-        def replace_in_text_element(element, old_text: str, new_text: str) -> bool:
-            text_nodes = []
-            for node in element.childNodes:
-                if node.nodeType == node.TEXT_NODE:
-                    text_nodes.append(node)
-            
-            full_text = "".join([node.data for node in text_nodes])
-            
-            if old_text in full_text:
-                for node in text_nodes:
-                    element.removeChild(node)
-                
-                parts = full_text.split(old_text, 1)
-                if len(parts) == 2:
-                    if parts[0]:
-                        text_node = doc.createTextNode(parts[0])
-                        element.appendChild(text_node)
-                    new_text_node = doc.createTextNode(new_text)
-                    element.appendChild(new_text_node)
-                    if parts[1]:
-                        remaining_node = doc.createTextNode(parts[1])
-                        element.appendChild(remaining_node)
-                    return True
-            return False
-        
-        for replacement in all_replacements:
-            old_text = replacement.get("from", "")
-            new_text = replacement.get("to", "")
-            
-            if not old_text or old_text == new_text:
-                continue
-            
-            for paragraph in doc.getElementsByType(P):
-                replace_in_text_element(paragraph, old_text, new_text)
-        
-        doc.save(str(file_path))
-        
+
+        from odf.opendocument import load
+
+        doc = load(str(file_path))
+        if _apply_mapping_to_odf_doc(doc, mapping):
+            doc.save(str(file_path))
+
     except Exception as e:
         raise RuntimeError(f"Failed to edit ODT file {file_path}: {e}") from e
 
 
+def customize_resume(source_path: Path, dest_path: Path, replacements: Dict[str, List[Dict[str, str]]]) -> Path:
+    """Write a customized copy of `source_path` directly to `dest_path`.
+
+    The source document is parsed once, replacements are applied in memory,
+    and the result is saved straight to the destination — no intermediate
+    byte copy of the archive.
+    """
+    suffix = source_path.suffix.lower()
+    if suffix not in (".docx", ".odt"):
+        raise ValueError(f"Unsupported file format for editing: {suffix}. Use .docx or .odt")
+
+    mapping = _build_mapping(replacements)
+
+    try:
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
+
+        if suffix == ".docx":
+            from docx import Document
+
+            doc = Document(str(source_path))
+            if mapping:
+                _apply_mapping_to_doc(doc, mapping)
+        else:
+            from odf.opendocument import load
+
+            doc = load(str(source_path))
+            if mapping:
+                _apply_mapping_to_odf_doc(doc, mapping)
+
+        doc.save(str(dest_path))
+        return dest_path
+
+    except Exception as e:
+        raise RuntimeError(
+            f"Failed to customize {source_path} into {dest_path}: {e}"
+        ) from e
+
+
 def apply_replacements(file_path: Path, replacements: Dict[str, List[Dict[str, str]]]) -> None:
+    combined = (
+        replacements.get("role_replacements", [])
+        + replacements.get("skill_replacements", [])
+    )
+    if not combined:
+        # Nothing to do; skip the docx/odf imports entirely.
+        return
+
     suffix = file_path.suffix.lower()
-    
+
     if suffix == ".docx":
         apply_replacements_to_docx(file_path, replacements)
     elif suffix == ".odt":
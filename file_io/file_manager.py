@@ -1,6 +1,9 @@
-import shutil
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from .document_editor import sanitize_filename
+from typing import Dict, Iterable, List, Tuple
+from .document_editor import customize_resume, fast_copy, sanitize_filename
 
 def prepare_company_directory(data_dir: Path, company_name: str) -> Path:
     sanitized_name = sanitize_filename(company_name)
@@ -17,15 +20,74 @@ def save_cover_letter(company_dir: Path, cover_letter_content: str) -> Path:
     file_path.write_text(cover_letter_content, encoding="utf-8")
     return file_path
 
-def copy_resume_to_company_dir(source_path: Path, company_dir: Path, company_name: str) -> Path:
+def _company_resume_path(source_path: Path, company_dir: Path, company_name: str) -> Path:
     sanitized_company = sanitize_filename(company_name)
     if not sanitized_company or sanitized_company == "unknown":
         sanitized_company = "customized"
-        
-    stem = source_path.stem
-    suffix = source_path.suffix
-    new_name = f"{stem}_{sanitized_company}{suffix}"
-    destination_path = company_dir / new_name
-    
-    shutil.copy2(source_path, destination_path)
+
+    return company_dir / f"{source_path.stem}_{sanitized_company}{source_path.suffix}"
+
+
+def copy_resume_to_company_dir(source_path: Path, company_dir: Path, company_name: str) -> Path:
+    destination_path = _company_resume_path(source_path, company_dir, company_name)
+    fast_copy(source_path, destination_path)
     return destination_path
+
+
+def customize_resume_for_company(
+    source_path: Path,
+    company_dir: Path,
+    company_name: str,
+    replacements: Dict[str, List[Dict[str, str]]],
+) -> Path:
+    """Produce the company-specific resume in one read/write of the archive.
+
+    Unlike copy_resume_to_company_dir + apply_replacements, the source is
+    parsed once and saved straight to the company directory, skipping the
+    intermediate byte copy and its extra decompress/compress round.
+    """
+    destination_path = _company_resume_path(source_path, company_dir, company_name)
+    return customize_resume(source_path, destination_path, replacements)
+
+
+def _customize_one(args: Tuple[Path, Path, str, Dict[str, List[Dict[str, str]]]]) -> Path:
+    # Module-level so it stays picklable for the process pool.
+    source_path, output_dir, company_name, replacements = args
+    company_dir = prepare_company_directory(output_dir, company_name)
+    return customize_resume_for_company(source_path, company_dir, company_name, replacements)
+
+
+def batch_customize(
+    source_path: Path,
+    output_dir: Path,
+    jobs: Iterable[Tuple[str, Dict[str, List[Dict[str, str]]]]],
+) -> List[Path]:
+    """Customize one resume for many companies in parallel.
+
+    `jobs` is an iterable of (company_name, replacements) pairs. Each job
+    writes to its own company directory, so the CPU-bound XML work runs on a
+    process pool with no shared mutable state.
+    """
+    tasks = [
+        (source_path, output_dir, company_name, replacements)
+        for company_name, replacements in jobs
+    ]
+    if not tasks:
+        return []
+
+    max_workers = min(os.cpu_count() or 1, len(tasks))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_customize_one, tasks))
+
+
+def _preload_document_libraries():
+    # Warm sys.modules so the first customize call does not pay the heavy
+    # docx/odf (and transitively lxml) import on the critical path.
+    try:
+        import docx  # noqa: F401
+        import odf.opendocument  # noqa: F401
+    except Exception:
+        pass
+
+
+threading.Thread(target=_preload_document_libraries, daemon=True).start()
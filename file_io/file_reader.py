@@ -1,62 +1,130 @@
 import os
 from typing import Union
 
+_DOCX_MAIN_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
 def read_docx(file_path: str) -> str:
-    from docx import Document
+    import zipfile
+    from lxml import etree
+
+    p_tag = f"{{{_DOCX_MAIN_NS}}}p"
+    tbl_tag = f"{{{_DOCX_MAIN_NS}}}tbl"
+    tr_tag = f"{{{_DOCX_MAIN_NS}}}tr"
+    tc_tag = f"{{{_DOCX_MAIN_NS}}}tc"
+    r_tag = f"{{{_DOCX_MAIN_NS}}}r"
+    t_tag = f"{{{_DOCX_MAIN_NS}}}t"
+    tab_tag = f"{{{_DOCX_MAIN_NS}}}tab"
+    br_tag = f"{{{_DOCX_MAIN_NS}}}br"
+    cr_tag = f"{{{_DOCX_MAIN_NS}}}cr"
+
+    def paragraph_text(paragraph) -> str:
+        # itertext() alone would drop w:tab/w:br/w:cr and mash tab-aligned
+        # columns and soft line breaks together; render them as "\t"/"\n"
+        # the way python-docx's paragraph.text does. Only w:tab inside a
+        # run is a literal tab — the ones under w:pPr/w:tabs are stop
+        # definitions, which walking runs skips naturally.
+        parts = []
+        for run in paragraph.iter(r_tag):
+            for node in run:
+                if node.tag == t_tag:
+                    parts.append(node.text or "")
+                elif node.tag == tab_tag:
+                    parts.append("\t")
+                elif node.tag in (br_tag, cr_tag):
+                    parts.append("\n")
+        return "".join(parts)
 
-    document = Document(file_path)
     content = []
-    
-    for p in document.paragraphs:
-        if p.text.strip():
-            content.append(p.text)
-
-    for table in document.tables:
-        for row in table.rows:
-            row_text = []
-            for cell in row.cells:
-                if cell.text.strip():
-                    row_text.append(cell.text.strip())
-            if row_text:
-                content.append(" | ".join(row_text))
+    table_rows = []
+    table_depth = 0
+
+    # Stream word/document.xml instead of building python-docx Paragraph/Run
+    # wrappers; elements are cleared as soon as their text has been collected.
+    with zipfile.ZipFile(file_path) as archive, archive.open("word/document.xml") as stream:
+        for event, element in etree.iterparse(stream, events=("start", "end")):
+            if event == "start":
+                if element.tag == tbl_tag:
+                    table_depth += 1
+                continue
 
+            if element.tag == p_tag:
+                if table_depth == 0:
+                    text = paragraph_text(element)
+                    if text.strip():
+                        content.append(text)
+                    element.clear()
+            elif element.tag == tr_tag and table_depth == 1:
+                row_text = []
+                for cell in element:
+                    if cell.tag != tc_tag:
+                        continue
+                    cell_text = "\n".join(
+                        paragraph_text(p) for p in cell if p.tag == p_tag
+                    ).strip()
+                    if cell_text:
+                        row_text.append(cell_text)
+                if row_text:
+                    table_rows.append(" | ".join(row_text))
+                element.clear()
+            elif element.tag == tbl_tag:
+                table_depth -= 1
+                if table_depth == 0:
+                    element.clear()
+
+    content.extend(table_rows)
     return "\n".join(content)
 
 
+_ODT_TEXT_NS = "urn:oasis:names:tc:opendocument:xmlns:text:1.0"
+_ODT_TABLE_NS = "urn:oasis:names:tc:opendocument:xmlns:table:1.0"
+
+
 def read_odt(file_path: str) -> str:
-    from odf.opendocument import load
-    from odf.text import P
-    from odf.table import Table, TableRow, TableCell
+    import zipfile
+    from lxml import etree
+
+    p_tag = f"{{{_ODT_TEXT_NS}}}p"
+    table_tag = f"{{{_ODT_TABLE_NS}}}table"
+    row_tag = f"{{{_ODT_TABLE_NS}}}table-row"
+    cell_tag = f"{{{_ODT_TABLE_NS}}}table-cell"
 
-    doc = load(file_path)
     content = []
+    table_rows = []
+    table_depth = 0
+
+    # Stream content.xml instead of materializing the full ODF object tree;
+    # elements are cleared as soon as their text has been collected.
+    with zipfile.ZipFile(file_path) as archive, archive.open("content.xml") as stream:
+        for event, element in etree.iterparse(stream, events=("start", "end")):
+            if event == "start":
+                if element.tag == table_tag:
+                    table_depth += 1
+                continue
 
-    for element in doc.getElementsByType(P):
-        text_parts = []
-        for node in element.childNodes:
-            if node.nodeType == node.TEXT_NODE:
-                text_parts.append(node.data)
-        paragraph_text = "".join(text_parts).strip()
-        if paragraph_text:
-            content.append(paragraph_text)
-
-    for table in doc.getElementsByType(Table):
-        for row in table.getElementsByType(TableRow):
-            row_text = []
-            for cell in row.getElementsByType(TableCell):
-                cell_text_parts = []
-                for p_node in cell.getElementsByType(P):
-                    for node in p_node.childNodes:
-                        if node.nodeType == node.TEXT_NODE:
-                           cell_text_parts.append(node.data)
-                
-                cell_text = "".join(cell_text_parts).strip()
-                if cell_text:
-                    row_text.append(cell_text)
-            
-            if row_text:
-                content.append(" | ".join(row_text))
+            if element.tag == p_tag:
+                paragraph_text = "".join(element.itertext()).strip()
+                if paragraph_text:
+                    content.append(paragraph_text)
+                # Paragraphs inside tables are still needed for the row pass.
+                if table_depth == 0:
+                    element.clear()
+            elif element.tag == row_tag:
+                row_text = []
+                for cell in element:
+                    if cell.tag != cell_tag:
+                        continue
+                    cell_text = "".join(cell.itertext()).strip()
+                    if cell_text:
+                        row_text.append(cell_text)
+                if row_text:
+                    table_rows.append(" | ".join(row_text))
+                element.clear()
+            elif element.tag == table_tag:
+                table_depth -= 1
+                element.clear()
 
+    content.extend(table_rows)
     return "\n".join(content)
 
 
@@ -0,0 +1,400 @@
+import atexit
+import logging
+import os
+import random
+import selectors
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, List
+
+try:
+    import fcntl
+except ImportError:  # Windows has no flock; retries alone have to do there.
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def _check_libreoffice_available() -> bool:
+    # A PATH lookup answers "is libreoffice installed?" without the fork/exec
+    # (and 5 s timeout budget) of actually running `libreoffice --version`.
+    return shutil.which("libreoffice") is not None
+
+
+@lru_cache(maxsize=1)
+def _check_docx2pdf_available() -> bool:
+    # docx2pdf drives Word over COM, which only exists on Windows; elsewhere
+    # the import probe (and its pywin32 dependency chain) is pure startup
+    # cost for a back end that can never convert anything.
+    if sys.platform != "win32":
+        return False
+    try:
+        import docx2pdf  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class _LibreOfficeServer:
+    """Long-lived headless LibreOffice instance driven over UNO.
+
+    A one-shot soffice invocation pays the full startup cost (seconds) per
+    file. This singleton launches one listener process on first use and
+    reuses it for every conversion, so per-file cost drops to the actual
+    render. Requires the `uno` Python bindings that ship with LibreOffice;
+    callers fall back to one-shot invocations when they are missing.
+    """
+
+    _CONNECT_URL = (
+        "uno:socket,host=localhost,port=2002;urp;StarOffice.ComponentContext"
+    )
+
+    def __init__(self):
+        self._process = None
+        self._desktop = None
+
+    def available(self) -> bool:
+        try:
+            import uno  # noqa: F401
+        except ImportError:
+            return False
+        return _check_libreoffice_available()
+
+    def _connect(self):
+        import uno
+
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context
+        )
+        context = resolver.resolve(self._CONNECT_URL)
+        return context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", context
+        )
+
+    def _ensure_running(self):
+        if self._desktop is not None and self._process and self._process.poll() is None:
+            return
+
+        self._process = subprocess.Popen(
+            [
+                "libreoffice",
+                "--headless",
+                "--invisible",
+                "--norestore",
+                '--accept=socket,host=localhost,port=2002;urp;',
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        atexit.register(self.terminate)
+
+        # The listener takes a moment to accept connections after launch.
+        deadline = time.monotonic() + 15
+        last_error = None
+        while time.monotonic() < deadline:
+            try:
+                self._desktop = self._connect()
+                return
+            except Exception as e:
+                last_error = e
+                time.sleep(0.25)
+        raise RuntimeError(f"Could not connect to LibreOffice listener: {last_error}")
+
+    def convert(self, source_path: Path, pdf_path: Path) -> Path:
+        import uno
+        from com.sun.star.beans import PropertyValue
+
+        self._ensure_running()
+
+        def prop(name, value):
+            p = PropertyValue()
+            p.Name = name
+            p.Value = value
+            return p
+
+        source_url = uno.systemPathToFileUrl(str(source_path.resolve()))
+        pdf_url = uno.systemPathToFileUrl(str(pdf_path.resolve()))
+
+        document = self._desktop.loadComponentFromURL(
+            source_url, "_blank", 0, (prop("Hidden", True),)
+        )
+        if document is None:
+            raise RuntimeError(f"LibreOffice could not open {source_path}")
+
+        try:
+            document.storeToURL(pdf_url, (prop("FilterName", "writer_pdf_Export"),))
+        finally:
+            document.close(False)
+
+        if not os.path.exists(pdf_path):
+            raise RuntimeError(f"PDF was not created for {source_path}")
+
+        return pdf_path
+
+    def terminate(self):
+        if self._process and self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        self._process = None
+        self._desktop = None
+
+
+_soffice_server = _LibreOfficeServer()
+
+
+def _convert_with_libreoffice(source_path: Path, pdf_path: Path) -> Path:
+    if _soffice_server.available():
+        try:
+            return _soffice_server.convert(source_path, pdf_path)
+        except Exception as e:
+            logger.warning(
+                f"UNO conversion failed, falling back to one-shot soffice: {e}"
+            )
+
+    return _convert_with_libreoffice_oneshot(source_path, pdf_path)
+
+
+def _soffice_profile_arg() -> str:
+    # A per-process user profile sidesteps soffice's single-instance lock on
+    # the default profile, letting several workers convert concurrently.
+    profile_dir = Path(tempfile.gettempdir()) / f"magicresume_lo_profile_{os.getpid()}"
+    return f"-env:UserInstallation=file://{profile_dir}"
+
+
+def _wait_proc(process: subprocess.Popen, timeout: float) -> None:
+    """Wait for a child process with a pollable pidfd when the OS has one.
+
+    os.pidfd_open turns process exit into a readable file descriptor, so
+    the wait is one blocking poll with a hard deadline instead of waitpid's
+    sleep-and-retry loop. Falls back to Popen.wait where pidfds are
+    unavailable (non-Linux, or kernels before 5.3)."""
+    if not hasattr(os, "pidfd_open"):
+        process.wait(timeout=timeout)
+        return
+    try:
+        pidfd = os.pidfd_open(process.pid)
+    except OSError:  # Process already reaped, or pidfds disabled.
+        process.wait(timeout=timeout)
+        return
+    try:
+        with selectors.DefaultSelector() as selector:
+            selector.register(pidfd, selectors.EVENT_READ)
+            if not selector.select(timeout):
+                raise subprocess.TimeoutExpired(process.args, timeout)
+    finally:
+        os.close(pidfd)
+    process.wait()
+
+
+def _run_soffice(args, timeout: float) -> None:
+    # soffice writes little to stderr, so draining the pipe after exit is
+    # safe and the exit wait itself goes through the pidfd poll.
+    process = subprocess.Popen(
+        args, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+    try:
+        _wait_proc(process, timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+        raise
+    finally:
+        stderr = process.stderr.read() if process.stderr else b""
+        if process.stderr:
+            process.stderr.close()
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, args, stderr=stderr)
+
+
+def _run_soffice_with_wait(args, timeout: float, serialize: bool = True) -> None:
+    """Run a one-shot soffice command, serializing concurrent invocations.
+
+    soffice silently refuses to start while another instance holds the
+    default user profile, so parallel conversions would fail without ever
+    reporting an error. An exclusive lock on a shared temp file serializes
+    callers; acquisition polls with a short randomized sleep so colliding
+    workers do not retry in lockstep.
+    """
+    # Success output is never read, so only stderr is kept (it still ends up
+    # in CalledProcessError); no stdout pipe, no buffering of its bytes.
+    if fcntl is None or not serialize:
+        _run_soffice(args, timeout)
+        return
+
+    deadline = time.monotonic() + timeout
+    lock_path = Path(tempfile.gettempdir()) / "magicresume_soffice.lock"
+
+    with open(lock_path, "w") as lock_file:
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    raise subprocess.TimeoutExpired(args, timeout)
+                time.sleep(0.01 + random.random() * 0.02)
+        try:
+            remaining = max(deadline - time.monotonic(), 1.0)
+            _run_soffice(args, remaining)
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _convert_with_libreoffice_oneshot(source_path: Path, pdf_path: Path) -> Path:
+    try:
+        # The per-process profile removes the single-instance collision, so
+        # the flock serialization is unnecessary here.
+        _run_soffice_with_wait(
+            [
+                "libreoffice",
+                "--headless",
+                _soffice_profile_arg(),
+                "--convert-to",
+                "pdf",
+                "--outdir",
+                str(source_path.parent),
+                str(source_path),
+            ],
+            timeout=30,
+            serialize=False,
+        )
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+        # Only stat the source on the failure path; the common case never
+        # pays for an existence check.
+        if not os.path.exists(source_path):
+            raise FileNotFoundError(f"File not found: {source_path}") from e
+        logger.error(f"LibreOffice conversion failed for {source_path}: {e}")
+        raise RuntimeError(f"Failed to convert {source_path} to PDF: {e}") from e
+
+    if not os.path.exists(pdf_path):
+        raise RuntimeError(f"PDF was not created for {source_path}")
+
+    return pdf_path
+
+
+def generate_pdf_from_docx(docx_path: Path) -> Path:
+    pdf_path = docx_path.with_suffix(".pdf")
+
+    if _check_docx2pdf_available():
+        try:
+            from docx2pdf import convert
+
+            convert(str(docx_path), str(pdf_path))
+            if os.path.exists(pdf_path):
+                return pdf_path
+        except Exception as e:
+            logger.warning(f"docx2pdf conversion failed, trying LibreOffice: {e}")
+
+    if _check_libreoffice_available():
+        return _convert_with_libreoffice(docx_path, pdf_path)
+
+    raise RuntimeError(
+        "No PDF converter available. Install LibreOffice or docx2pdf to "
+        "generate PDF output."
+    )
+
+
+def generate_pdf_from_odt(odt_path: Path) -> Path:
+    if not _check_libreoffice_available():
+        raise RuntimeError(
+            "No PDF converter available. Install LibreOffice to generate "
+            "PDF output from ODT files."
+        )
+
+    return _convert_with_libreoffice(odt_path, odt_path.with_suffix(".pdf"))
+
+
+def generate_pdf(file_path: Path) -> Path:
+    suffix = file_path.suffix.lower()
+
+    if suffix == ".docx":
+        return generate_pdf_from_docx(file_path)
+    elif suffix == ".odt":
+        return generate_pdf_from_odt(file_path)
+    else:
+        raise ValueError(f"Unsupported file format for PDF export: {suffix}. Use .docx or .odt")
+
+
+def generate_pdfs(paths: Iterable[Path]) -> List[Path]:
+    """Convert several documents to PDF in parallel.
+
+    Each worker process runs its own soffice with a per-process user profile
+    (see _soffice_profile_arg), so batch conversions scale with cores
+    instead of serializing on LibreOffice's single-instance lock.
+    """
+    paths = list(paths)
+    if not paths:
+        return []
+
+    max_workers = min(os.cpu_count() or 1, len(paths))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(generate_pdf, paths))
+
+
+async def generate_pdf_async(file_path: Path) -> Path:
+    """Convert a document to PDF without blocking the event loop.
+
+    The plain LibreOffice path runs through asyncio's subprocess support so
+    callers can overlap the conversion with other work. docx2pdf and the UNO
+    listener are blocking APIs, so when one of those would be used the
+    synchronous generate_pdf runs on a worker thread instead.
+    """
+    import asyncio
+
+    suffix = file_path.suffix.lower()
+    if suffix not in (".docx", ".odt"):
+        raise ValueError(f"Unsupported file format for PDF export: {suffix}. Use .docx or .odt")
+
+    uses_blocking_backend = (
+        suffix == ".docx" and _check_docx2pdf_available()
+    ) or _soffice_server.available()
+    if uses_blocking_backend:
+        return await asyncio.to_thread(generate_pdf, file_path)
+
+    if not _check_libreoffice_available():
+        raise RuntimeError(
+            "No PDF converter available. Install LibreOffice or docx2pdf to "
+            "generate PDF output."
+        )
+
+    pdf_path = file_path.with_suffix(".pdf")
+    process = await asyncio.create_subprocess_exec(
+        "libreoffice",
+        "--headless",
+        _soffice_profile_arg(),
+        "--convert-to",
+        "pdf",
+        "--outdir",
+        str(file_path.parent),
+        str(file_path),
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        _, stderr = await asyncio.wait_for(process.communicate(), timeout=30)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise RuntimeError(f"LibreOffice conversion timed out for {file_path}")
+
+    if process.returncode != 0:
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+        raise RuntimeError(
+            f"Failed to convert {file_path} to PDF: {stderr.decode(errors='replace')}"
+        )
+    if not os.path.exists(pdf_path):
+        raise RuntimeError(f"PDF was not created for {file_path}")
+
+    return pdf_path
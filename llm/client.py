@@ -1,5 +1,11 @@
+import asyncio
+import hashlib
 import os
-from google import genai
+from pathlib import Path
+from types import SimpleNamespace
+
+_CACHE_DIR = Path.home() / ".cache" / "magicresume"
+
 
 def _get_api_key() -> str:
     api_key = os.getenv("GEMINI_API_KEY")
@@ -10,20 +16,121 @@ def _get_api_key() -> str:
         )
     return api_key
 
-client = genai.Client(api_key=_get_api_key())
+_client = None
+
+
+def _get_client():
+    # Built on first use so importers that never call Gemini (and cache hits)
+    # skip the google-genai import and HTTP client construction entirely.
+    global _client
+    if _client is None:
+        from google import genai
+
+        _client = genai.Client(api_key=_get_api_key())
+    return _client
+
+
+def _cache_path(prompt: str) -> Path:
+    key = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    return _CACHE_DIR / f"{key}.json"
+
+
+def invalidate_cached_response(prompt: str) -> None:
+    """Drop the cached entry for a prompt whose response failed validation.
+
+    The cache stores raw model text before the caller has parsed it, so a
+    non-empty but malformed response would otherwise be replayed from disk
+    on every rerun of the same inputs. Callers should invalidate the entry
+    before propagating a validation error."""
+    try:
+        _cache_path(prompt).unlink()
+    except OSError:
+        pass
+
 
 def call_gemini(prompt):
+    # Identical prompts (same resume + job offer) hit the on-disk cache
+    # instead of re-billing the API on every rerun during iteration.
+    cache_path = _cache_path(prompt)
+    if cache_path.exists():
+        return SimpleNamespace(text=cache_path.read_text(encoding="utf-8"))
+
     try:
-        response = client.models.generate_content(
+        stream = _get_client().models.generate_content_stream(
             model="gemini-2.5-flash", contents=prompt
         )
-        
-        if not hasattr(response, "text") or not response.text:
+
+        # Consume chunks as they arrive so the network receive overlaps the
+        # Python-side assembly instead of blocking on the full response.
+        parts = []
+        for chunk in stream:
+            if chunk.text:
+                parts.append(chunk.text)
+        text = "".join(parts)
+
+        if not text:
             print(f"Error: Gemini API returned empty response.")
-            print(f"Full response object: {response}")
             raise RuntimeError("Gemini API returned an empty response")
-        
-        return response
+
+        try:
+            _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            cache_path.write_text(text, encoding="utf-8")
+        except OSError:
+            pass  # Caching is best-effort; the response is still good.
+
+        return SimpleNamespace(text=text)
+    except Exception as e:
+        print(f"Error calling Gemini API: {e}")
+        raise
+
+
+async def call_gemini_batch(prompts):
+    """Resolve several prompts against Gemini concurrently.
+
+    Cached prompts are served from disk; the misses go out in parallel
+    over the SDK's async client, so N job offers cost roughly one round
+    trip instead of N sequential ones. Results come back in prompt order.
+    """
+    results = [None] * len(prompts)
+    pending = []
+    for index, prompt in enumerate(prompts):
+        cache_path = _cache_path(prompt)
+        if cache_path.exists():
+            results[index] = SimpleNamespace(
+                text=cache_path.read_text(encoding="utf-8")
+            )
+        else:
+            pending.append(index)
+
+    if not pending:
+        return results
+
+    client = _get_client()
+    try:
+        responses = await asyncio.gather(
+            *(
+                client.aio.models.generate_content(
+                    model="gemini-2.5-flash", contents=prompts[index]
+                )
+                for index in pending
+            )
+        )
     except Exception as e:
         print(f"Error calling Gemini API: {e}")
-        raise
\ No newline at end of file
+        raise
+
+    for index, response in zip(pending, responses):
+        text = response.text or ""
+        if not text:
+            print(f"Error: Gemini API returned empty response.")
+            raise RuntimeError("Gemini API returned an empty response")
+
+        try:
+            _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            _cache_path(prompts[index]).write_text(text, encoding="utf-8")
+        except OSError:
+            pass  # Caching is best-effort; the response is still good.
+
+        results[index] = SimpleNamespace(text=text)
+
+    return results
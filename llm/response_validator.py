@@ -1,20 +1,31 @@
 import json
+import re
 from typing import Dict, Any
 
+# Each fence is optional on its own: models sometimes emit only the opening
+# fence (stopping right after the JSON) or only the closing one.
+_FENCE_RE = re.compile(r"^\s*(?:```(?:json)?\s*)?(.*?)\s*(?:```\s*)?$", re.DOTALL)
+
+try:
+    import orjson
+except ImportError:  # Rust-backed parser preferred; stdlib json still works.
+    orjson = None
+
+
+def _parse_json(text: str) -> Any:
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
 
 def validate_model_response(response_text: str) -> Dict[str, Any]:
-    response_text = response_text.strip()
-    if response_text.startswith("```json"):
-        response_text = response_text[7:]
-    elif response_text.startswith("```"):
-        response_text = response_text[3:]
-    if response_text.endswith("```"):
-        response_text = response_text[:-3]
-    response_text = response_text.strip()
-    
+    # Both fences being optional, the pattern always matches; group(1) is
+    # the payload with any fences and surrounding whitespace stripped.
+    response_text = _FENCE_RE.match(response_text).group(1)
+
     try:
-        parsed = json.loads(response_text)
-    except json.JSONDecodeError as e:
+        parsed = _parse_json(response_text)
+    except ValueError as e:  # covers json.JSONDecodeError and orjson.JSONDecodeError
         raise RuntimeError(f"Failed to parse Gemini response as JSON: {e}\nRaw response: {response_text}")
 
     if not isinstance(parsed, dict):
@@ -1,12 +1,22 @@
+import asyncio
+import hashlib
 import logging
 import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from llm.client import call_gemini
-from llm.prompt_builder import build_prompt
+from llm.client import call_gemini_batch, invalidate_cached_response
+from llm.prompt_builder import build_prompt, _load_template
 from llm.response_validator import validate_model_response
 from file_io.file_reader import read_document_as_text
 from file_io.document_detector import auto_detect_resume
-from file_io.document_editor import apply_replacements
+from file_io.pdf_generator import generate_pdf_async, _check_libreoffice_available
+
+try:
+    import orjson
+except ImportError:  # Rust-backed serializer preferred; stdlib json still works.
+    orjson = None
 
 
 # Configure logging
@@ -18,68 +28,189 @@ logger = logging.getLogger(__name__)
 
 BASE_DIR = Path(__file__).resolve().parent
 
-def main():
+
+def _pipeline_cache_path(resume_path: Path, job_offer_path: Path) -> Path:
+    # Keyed by the raw bytes of both inputs, so any edit to the resume or
+    # the job offer produces a fresh key and a fresh Gemini call.
+    hasher = hashlib.sha256()
+    hasher.update(resume_path.read_bytes())
+    hasher.update(b"\0")
+    hasher.update(job_offer_path.read_bytes())
+    return BASE_DIR / ".cache" / hasher.hexdigest() / "validated.json"
+
+
+def _print_json(obj) -> None:
+    if orjson is not None:
+        # One C-side serialization straight to the stdout buffer; orjson
+        # emits UTF-8 directly, matching ensure_ascii=False.
+        sys.stdout.buffer.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+        sys.stdout.buffer.write(b"\n")
+        sys.stdout.buffer.flush()
+    else:
+        print(json.dumps(obj, indent=2, ensure_ascii=False))
+
+
+async def _generate_company_outputs(resume_path: Path, validated_json):
+    """Produce the per-company outputs for one validated Gemini response.
+
+    Returns the summary details together with the still-running PDF task;
+    the caller awaits the task later, so the next company's customization
+    overlaps this company's soffice run."""
+    from file_io.file_manager import prepare_company_directory, save_cover_letter, customize_resume_for_company
+
+    company_name = validated_json.get("company_name", "unknown")
+    logger.info(f"Company name extracted: {company_name}")
+
+    logger.info(f"Preparing directory for company: {company_name}...")
+    output_dir = BASE_DIR / "outputs"
+    company_dir = prepare_company_directory(output_dir, company_name)
+    logger.info(f"Company directory ready: {company_dir}")
+
+    logger.info("Saving cover letter...")
+    cover_letter_text = validated_json.get("cover_letter", "")
+    cover_letter_path = save_cover_letter(company_dir, cover_letter_text)
+    logger.info(f"Cover letter saved to: {cover_letter_path}")
+
+    logger.info("Gemini found the following replacements:")
+    _print_json(validated_json)
+
+    logger.info("Customizing resume for company directory...")
+    duplicated_path = customize_resume_for_company(
+        resume_path, company_dir, company_name, validated_json
+    )
+    logger.info(f"Customized resume created: {duplicated_path.name}")
+
+    logger.info("Generating PDF version of the resume...")
+    pdf_task = asyncio.create_task(generate_pdf_async(duplicated_path))
+    # create_task only schedules the coroutine; without a yield the task
+    # would not run until the caller's next await, after all the remaining
+    # synchronous work. One yield lets it start spawning soffice now.
+    await asyncio.sleep(0)
+
+    return company_dir, cover_letter_path, duplicated_path, pdf_task
+
+
+def _warm_caches():
+    # Populate the converter-availability and prompt-template caches while
+    # the pipeline is busy with file I/O and the Gemini round trip, so later
+    # build_prompt/generate_pdf calls hit warm caches.
+    try:
+        _check_libreoffice_available()
+        _load_template()
+        # Importing file_manager kicks off its docx/odf preload thread;
+        # nothing else imports it until the first company is processed,
+        # which is after the Gemini round trip — too late to help.
+        import file_io.file_manager  # noqa: F401
+    except Exception:
+        pass
+
+
+async def main():
     try:
         logger.info("Starting program...")
-        
+        threading.Thread(target=_warm_caches, daemon=True).start()
+
         data_dir = BASE_DIR / "data"
         logger.info(f"Auto-detecting resume file in {data_dir}...")
         resume_path = auto_detect_resume(data_dir)
         logger.info(f"Found resume file: {resume_path.name}")
         
-        job_offer_path = BASE_DIR / "data" / "job.txt"
-        if not job_offer_path.exists():
-            raise FileNotFoundError(f"Job offer file not found: {job_offer_path}")
-        
-        logger.info("Reading resume and job offer documents...")
-        resume_content = read_document_as_text(str(resume_path))
-        job_offer_content = read_document_as_text(str(job_offer_path))
-        
-        logger.info("Building initial prompt...")
-        prompt = build_prompt(resume_content, job_offer_content)
-        
-        logger.info("Calling Gemini API...")
-        response = call_gemini(prompt)
-        
-        logger.info("Validating and parsing response...")
-        validated_json = validate_model_response(response.text)
-        
-        company_name = validated_json.get("company_name", "unknown")
-        logger.info(f"Company name extracted: {company_name}")
-        
-        logger.info(f"Preparing directory for company: {company_name}...")
-        from file_io.file_manager import prepare_company_directory, save_cover_letter, copy_resume_to_company_dir
-        
-        output_dir = BASE_DIR / "outputs"
-        company_dir = prepare_company_directory(output_dir, company_name)
-        logger.info(f"Company directory ready: {company_dir}")
-
-        logger.info("Saving cover letter...")
-        cover_letter_text = validated_json.get("cover_letter", "")
-        cover_letter_path = save_cover_letter(company_dir, cover_letter_text)
-        logger.info(f"Cover letter saved to: {cover_letter_path}")
-        
-        logger.info("Gemini found the following replacements:")
-        print(json.dumps(validated_json, indent=2, ensure_ascii=False))
-        
-        logger.info(f"Copying resume to company directory...")
-        duplicated_path = copy_resume_to_company_dir(resume_path, company_dir, company_name)
-        logger.info(f"Created working copy: {duplicated_path.name}")
-        
-        logger.info("Applying replacements to document...")
-        apply_replacements(duplicated_path, validated_json)
-        logger.info("Replacements applied successfully")
-        
+        # Every .txt under data/jobs/ is one job offer; a lone data/job.txt
+        # keeps the original single-offer behavior. No exists() pre-checks:
+        # the reads below raise FileNotFoundError themselves, which the
+        # handler at the bottom already reports.
+        jobs_dir = data_dir / "jobs"
+        job_paths = sorted(jobs_dir.glob("*.txt")) if jobs_dir.is_dir() else []
+        if not job_paths:
+            job_paths = [data_dir / "job.txt"]
+        logger.info(f"Processing {len(job_paths)} job offer(s)...")
 
-        
-        logger.info("=" * 60)
-        logger.info("Process completed successfully!")
-        logger.info(f"Output Directory: {company_dir}")
-        logger.info(f"Cover Letter: {cover_letter_path.name}")
-        logger.info(f"Edited CV: {duplicated_path.name}")
+        # A rerun with unchanged inputs reuses the validated response from
+        # disk and skips document parsing and the Gemini round trip entirely.
+        validated_by_job = {}
+        misses = []
+        for job_path in job_paths:
+            cache_path = _pipeline_cache_path(resume_path, job_path)
+            if cache_path.exists():
+                logger.info(f"Using cached response for {job_path.name}.")
+                validated_by_job[job_path] = json.loads(
+                    cache_path.read_text(encoding="utf-8")
+                )
+            else:
+                misses.append((job_path, cache_path))
+
+        if misses:
+            logger.info("Reading resume and job offer documents...")
+            # Independent reads; zipfile/lxml release the GIL, so threads
+            # bring wall time down to the slowest single read.
+            with ThreadPoolExecutor(max_workers=1 + len(misses)) as executor:
+                resume_future = executor.submit(read_document_as_text, str(resume_path))
+                job_futures = [
+                    executor.submit(read_document_as_text, str(job_path))
+                    for job_path, _ in misses
+                ]
+                resume_content = resume_future.result()
+                job_contents = [future.result() for future in job_futures]
+
+            logger.info("Building prompts...")
+            prompts = [
+                build_prompt(resume_content, job_content)
+                for job_content in job_contents
+            ]
+
+            logger.info(f"Calling Gemini API for {len(prompts)} offer(s)...")
+            responses = await call_gemini_batch(prompts)
+
+            logger.info("Validating and parsing responses...")
+            for (job_path, cache_path), prompt, response in zip(
+                misses, prompts, responses
+            ):
+                try:
+                    validated_json = validate_model_response(response.text)
+                except RuntimeError:
+                    # Drop the raw-text cache entry so the next run retries
+                    # the API instead of replaying the malformed response.
+                    invalidate_cached_response(prompt)
+                    raise
+                try:
+                    cache_path.parent.mkdir(parents=True, exist_ok=True)
+                    cache_path.write_text(
+                        json.dumps(validated_json, ensure_ascii=False),
+                        encoding="utf-8",
+                    )
+                except OSError:
+                    pass  # Caching is best-effort; the pipeline continues either way.
+                validated_by_job[job_path] = validated_json
+
+        # First pass starts every company's PDF conversion as soon as its
+        # customized resume exists; the summaries below await the tasks, so
+        # soffice runs overlap the remaining customization work.
+        results = []
+        for job_path in job_paths:
+            results.append(
+                await _generate_company_outputs(
+                    resume_path, validated_by_job[job_path]
+                )
+            )
+
+        for company_dir, cover_letter_path, duplicated_path, pdf_task in results:
+            pdf_path = None
+            try:
+                pdf_path = await pdf_task
+                logger.info(f"PDF created: {pdf_path.name}")
+            except RuntimeError as e:
+                logger.warning(f"PDF generation skipped: {e}")
+
+            logger.info("=" * 60)
+            logger.info("Process completed successfully!")
+            logger.info(f"Output Directory: {company_dir}")
+            logger.info(f"Cover Letter: {cover_letter_path.name}")
+            logger.info(f"Edited CV: {duplicated_path.name}")
+            if pdf_path:
+                logger.info(f"PDF CV: {pdf_path.name}")
+
+            logger.info("=" * 60)
 
-        logger.info("=" * 60)
-        
     except FileNotFoundError as e:
         logger.error(f"File not found: {e}")
         raise
@@ -94,4 +225,4 @@ def main():
         raise
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())